@@ -0,0 +1,170 @@
+# cache.py
+"""
+Two-level memoizer for yfinance endpoint responses.
+Entries are keyed on (ticker, endpoint, day). An in-process dict answers repeated
+lookups within a run (e.g. the same peer across several DataFetcher instances);
+behind it, entries are pickled under ~/.fondawork_cache/ so re-running an analysis
+for the same ticker on the same trading day does not hit Yahoo again.
+Entries older than the TTL are ignored, and the oldest entries are evicted first
+once either level grows past its size limit (the disk level is checked every
+EVICT_EVERY writes rather than on each one).
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+CACHE_DIR = Path(os.environ.get("FONDAWORK_CACHE_DIR", Path.home() / ".fondawork_cache"))
+DEFAULT_TTL = 24 * 3600  # seconds
+MAX_ENTRIES = 1000
+MAX_MEMORY_ENTRIES = 256
+EVICT_EVERY = 50  # disk writes between eviction scans
+
+# what a bad/missing/truncated cache file or an unwritable cache dir can raise
+CACHE_ERRORS = (OSError, pickle.PickleError, EOFError, AttributeError)
+
+# (TICKER, endpoint, day) -> (stored_at, value); insertion order gives FIFO eviction
+_memory: dict = {}
+_memory_lock = threading.Lock()
+
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def _memory_key(ticker: str, endpoint: str) -> tuple:
+    return ticker.upper(), endpoint, date.today().isoformat()
+
+
+def _memory_put(key: tuple, value: Any, stored_at: float) -> None:
+    with _memory_lock:
+        _memory.pop(key, None)
+        _memory[key] = (stored_at, value)
+        while len(_memory) > MAX_MEMORY_ENTRIES:
+            _memory.pop(next(iter(_memory)))
+
+
+def _copy(value: Any) -> Any:
+    """Own copy of a cached DataFrame (deep) or dict (shallow) so callers cannot mutate the shared entry."""
+    copy = getattr(value, "copy", None)
+    return copy() if callable(copy) else value
+
+
+def _cache_path(ticker: str, endpoint: str) -> Path:
+    raw = f"{ticker.upper()}|{endpoint}|{date.today().isoformat()}"
+    return CACHE_DIR / (hashlib.sha1(raw.encode("utf-8")).hexdigest() + ".pkl")
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if hasattr(value, "empty"):
+        return bool(value.empty)
+    return not value
+
+
+def cache_get(ticker: str, endpoint: str, ttl: float = DEFAULT_TTL) -> Optional[Any]:
+    """
+    Return the cached value for (ticker, endpoint) or None if missing/expired.
+    Every call returns its own copy, so the caller may modify it freely.
+    """
+    key = _memory_key(ticker, endpoint)
+    hit = _memory.get(key)
+    if hit is not None and time.time() - hit[0] <= ttl:
+        return _copy(hit[1])
+
+    path = _cache_path(ticker, endpoint)
+    try:
+        stored_at = path.stat().st_mtime
+        if time.time() - stored_at > ttl:
+            return None
+        with path.open("rb") as fh:
+            value = pickle.load(fh)
+    except CACHE_ERRORS:
+        return None
+    _memory_put(key, value, stored_at)
+    return _copy(value)
+
+
+def cache_set(ticker: str, endpoint: str, value: Any) -> None:
+    """Store a value for (ticker, endpoint). Empty results are not cached."""
+    if _is_empty(value):
+        return
+    _memory_put(_memory_key(ticker, endpoint), _copy(value), time.time())
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _cache_path(ticker, endpoint)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except CACHE_ERRORS:
+        return
+    _maybe_evict()
+
+
+def _maybe_evict() -> None:
+    """
+    Run the directory scan on the first write of the process (short CLI runs)
+    and then every EVICT_EVERY writes.
+    """
+    global _writes
+    with _writes_lock:
+        due = _writes % EVICT_EVERY == 0
+        _writes += 1
+    if due:
+        _evict()
+
+
+def _evict() -> None:
+    """FIFO eviction: drop the oldest entries beyond MAX_ENTRIES."""
+    try:
+        files = list(CACHE_DIR.glob("*.pkl"))
+        if len(files) <= MAX_ENTRIES:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+    except OSError:
+        return
+    for path in files[:max(0, len(files) - MAX_ENTRIES)]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def clear_cache() -> None:
+    """Remove every cached entry, in memory and on disk."""
+    with _memory_lock:
+        _memory.clear()
+    if not CACHE_DIR.exists():
+        return
+    for path in CACHE_DIR.glob("*.pkl"):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def disk_cached(ttl: float = DEFAULT_TTL):
+    """
+    Decorator for DataFetcher methods: memoize the result on disk keyed on
+    (self.ticker_str, method name, today).
+    """
+    def decorator(fn):
+        endpoint = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            cached = cache_get(self.ticker_str, endpoint, ttl=ttl)
+            if cached is not None:
+                return cached
+            value = fn(self, *args, **kwargs)
+            cache_set(self.ticker_str, endpoint, value)
+            return value
+        return wrapper
+    return decorator
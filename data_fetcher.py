@@ -3,77 +3,317 @@
 Robust data fetcher for yfinance tickers.
 Tries multiple endpoints because different tickers (especially non-US)
 expose different fields. Returns cleaned pandas DataFrames and an `info` dict.
+
+The four endpoints (income, balance, cashflow, info) are fetched concurrently
+when a DataFetcher is built, and `DataFetcher.fetch_many` does the same for a
+whole list of tickers at once, since every call is a blocking HTTP request
+(`fetch_many_async` gathers the same requests from an asyncio event loop).
+Endpoint responses are memoized on disk for the day (see cache.py), and
+yf.Ticker objects are shared per symbol and day within the process.
 """
 
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
 import yfinance as yf
 import pandas as pd
-from typing import Tuple, Dict, Any
+try:
+    from yfinance.exceptions import YFException
+except ImportError:  # older yfinance without a common exception base
+    YFException = OSError
+from typing import Tuple, Dict, Any, List, Optional
+
+from cache import disk_cached, clear_cache as clear_disk_cache
+from http_session import SESSION
+
+logger = logging.getLogger(__name__)
+
+# Errors a Yahoo fetch can reasonably raise: network failures (requests' and
+# curl_cffi's exceptions are OSError subclasses), yfinance errors such as rate
+# limiting, bad/missing payloads, parsing.
+FETCH_ERRORS = (OSError, YFException, KeyError, ValueError, AttributeError, TypeError, IndexError)
+
+# info keys that yfinance's cheap `fast_info` exposes, mapped to their fast_info names
+FAST_INFO_KEYS = {
+    "currentPrice": "last_price",
+    "marketCap": "market_cap",
+    "sharesOutstanding": "shares",
+}
+
+# statement/info attributes fetched by prefetch()
+ENDPOINTS = ("income", "balance", "cashflow", "info")
+
+# Yahoo's spark endpoint accepts at most 20 symbols per request
+SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+SPARK_CHUNK = 20
+
+# shared yf.Ticker instances, keyed by (upper-case symbol, day) like the endpoint
+# cache: a yf.Ticker memoizes its downloads, so it must not outlive the cache window.
+# Least recently used entries are dropped past MAX_SYMBOLS.
+MAX_SYMBOLS = 128
+_symbols: "OrderedDict[Tuple[str, str], yf.Ticker]" = OrderedDict()
+_symbols_lock = threading.Lock()
+
+
+def get_asset(ticker: str, session=None) -> yf.Ticker:
+    """
+    Return the shared yf.Ticker for a symbol, creating it on first use each day.
+    `session` is handed to yf.Ticker on creation; by default yfinance uses its own
+    process-wide session, so connections are already reused across tickers.
+    """
+    key = (ticker.upper(), date.today().isoformat())
+    with _symbols_lock:
+        asset = _symbols.get(key)
+        if asset is not None:
+            _symbols.move_to_end(key)
+            return asset
+        asset = yf.Ticker(ticker, session=session) if session is not None else yf.Ticker(ticker)
+        _symbols[key] = asset
+        while len(_symbols) > MAX_SYMBOLS:
+            _symbols.popitem(last=False)
+        return asset
+
+
+def clear_cache() -> None:
+    """Drop both the shared yf.Ticker instances and the on-disk endpoint cache."""
+    with _symbols_lock:
+        _symbols.clear()
+    clear_disk_cache()
+
+
+def _chronological(df: pd.DataFrame) -> pd.DataFrame:
+    """Oldest period first. yfinance returns newest first, so a reversed view usually suffices."""
+    if df.index.is_monotonic_increasing:
+        return df
+    if df.index.is_monotonic_decreasing:
+        return df.iloc[::-1]
+    return df.sort_index()
 
 
 class DataFetcher:
-    def __init__(self, ticker: str):
+    # candidate attribute names the installed yf.Ticker class does not define
+    _ABSENT_ATTRS: set = set()
+
+    def __init__(self, ticker: str, asset: Optional[yf.Ticker] = None, prefetch: bool = True,
+                 session=None):
         self.ticker_str = ticker
-        self.asset = yf.Ticker(ticker)
+        self.asset = asset if asset is not None else get_asset(ticker, session=session)
+        if prefetch:
+            self.prefetch()
+
+    @classmethod
+    def fetch_many(cls, tickers: List[str], max_workers: int = 20,
+                   session=None) -> Dict[str, "DataFetcher"]:
+        """
+        Build one prefetched DataFetcher per ticker, fetching all tickers concurrently.
+        Returns dict ticker -> DataFetcher (duplicates are fetched once).
+        """
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        if not tickers:
+            return {}
+        workers = max(1, min(max_workers, len(tickers)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {t: pool.submit(cls, t, session=session) for t in tickers}
+            return {t: f.result() for t, f in futures.items()}
+
+    @classmethod
+    async def fetch_many_async(cls, tickers: List[str], endpoints=ENDPOINTS,
+                               session=None) -> Dict[str, "DataFetcher"]:
+        """
+        Async counterpart of fetch_many: every (ticker, endpoint) request of the
+        batch is gathered in one event loop, each blocking call in a worker thread.
+        Returns dict ticker -> DataFetcher with `endpoints` already loaded.
+        """
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        fetchers = {t: cls(t, prefetch=False, session=session) for t in tickers}
+        await asyncio.gather(*(
+            asyncio.to_thread(getattr, f, name)
+            for f in fetchers.values() for name in endpoints
+        ))
+        return fetchers
+
+    @staticmethod
+    def batch_quote(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest quotes for many tickers with one HTTP request per 20 symbols.
+        Returns dict ticker -> {"currentPrice", "previousClose"} (tickers Yahoo
+        does not know are left out). Only price data is available from this endpoint.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        quotes: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(tickers), SPARK_CHUNK):
+            chunk = tickers[i:i + SPARK_CHUNK]
+            try:
+                resp = SESSION.get(
+                    SPARK_URL,
+                    params={"symbols": ",".join(chunk), "range": "1d", "interval": "1d"},
+                    timeout=5,
+                )
+                resp.raise_for_status()
+                data = resp.json() or {}
+            except (OSError, ValueError) as e:
+                logger.warning("spark quote failed for %s: %s", ",".join(chunk), e)
+                continue
+            for symbol, payload in data.items():
+                if not isinstance(payload, dict):
+                    continue
+                closes = [c for c in (payload.get("close") or []) if c is not None]
+                if not closes:
+                    continue
+                quotes[symbol] = {
+                    "currentPrice": float(closes[-1]),
+                    "previousClose": payload.get("chartPreviousClose") or payload.get("previousClose"),
+                }
+        return quotes
+
+    def prefetch(self) -> None:
+        """Fetch income, balance, cashflow and info in parallel; later access is free."""
+        with ThreadPoolExecutor(max_workers=len(ENDPOINTS)) as pool:
+            # each endpoint property stores its own result in the instance __dict__
+            for future in [pool.submit(getattr, self, name) for name in ENDPOINTS]:
+                future.result()
 
     def _safe_df(self, getter_name: str) -> pd.DataFrame:
         """Call a yfinance attribute or method and return a transposed, sorted DataFrame or empty."""
         try:
             obj = getattr(self.asset, getter_name)
+        except AttributeError:
+            # attribute not offered by this yfinance version; caller tries the next name
+            return pd.DataFrame()
+        try:
             # some are methods
-            if callable(obj):
-                df = obj()
-            else:
-                df = obj
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                df = df.T
-                try:
-                    df.index = pd.to_datetime(df.index)
-                except Exception:
-                    pass
-                return df.sort_index()
-        except Exception:
-            pass
-        return pd.DataFrame()
+            df = obj() if callable(obj) else obj
+        except FETCH_ERRORS as e:
+            logger.warning("%s: %s failed: %s", self.ticker_str, getter_name, e)
+            return pd.DataFrame()
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return pd.DataFrame()
+        df = df.T
+        # yfinance usually hands back Timestamp columns already; only parse otherwise
+        if not isinstance(df.index, pd.DatetimeIndex):
+            try:
+                df.index = pd.to_datetime(df.index, format="ISO8601", cache=True)
+            except (ValueError, TypeError):
+                pass
+        return _chronological(df)
 
-    def get_income(self) -> pd.DataFrame:
-        # try several common yfinance attributes
-        for name in ("financials", "get_income_stmt", "income_stmt", "get_financials"):
+    def _first_frame(self, names: Tuple[str, ...]) -> pd.DataFrame:
+        """
+        First non-empty frame among the candidate yfinance attributes, in the fixed
+        preference order (the pretty-labelled properties come first). Names the
+        yf.Ticker class lacks are remembered and skipped for every later ticker.
+        """
+        cls = type(self.asset)
+        for name in names:
+            if name in DataFetcher._ABSENT_ATTRS:
+                continue
+            # class-level check first: does not trigger the property's download
+            if not hasattr(cls, name) and name not in getattr(self.asset, "__dict__", {}):
+                DataFetcher._ABSENT_ATTRS.add(name)
+                continue
             df = self._safe_df(name)
             if not df.empty:
                 return df
         return pd.DataFrame()
 
+    @disk_cached()
+    def _fetch_income(self) -> pd.DataFrame:
+        # try several common yfinance attributes
+        return self._first_frame(("financials", "get_income_stmt", "income_stmt", "get_financials"))
+
+    @disk_cached()
+    def _fetch_balance(self) -> pd.DataFrame:
+        return self._first_frame(("balance_sheet", "get_balance_sheet", "balance"))
+
+    @disk_cached()
+    def _fetch_cashflow(self) -> pd.DataFrame:
+        return self._first_frame(("cashflow", "get_cashflow"))
+
+    def _fast_info(self, keys=FAST_INFO_KEYS) -> Dict[str, Any]:
+        """Read the requested price/size fields from `fast_info`, skipping missing ones."""
+        out = {}
+        try:
+            fast = self.asset.fast_info
+        except FETCH_ERRORS as e:
+            logger.warning("%s: fast_info failed: %s", self.ticker_str, e)
+            return out
+        for key in keys:
+            try:
+                val = fast[FAST_INFO_KEYS[key]]
+            except FETCH_ERRORS:
+                continue
+            if val is not None:
+                out[key] = val
+        return out
+
+    @disk_cached()
+    def _fetch_info(self) -> Dict[str, Any]:
+        try:
+            info = dict(self.asset.info or {})
+        except FETCH_ERRORS as e:
+            logger.warning("%s: info failed: %s", self.ticker_str, e)
+            info = {}
+        # fill price/size fields the scrape left out (common for non-US tickers)
+        missing = [k for k in FAST_INFO_KEYS if not info.get(k)]
+        if missing:
+            info.update(self._fast_info(missing))
+        return info
+
+    # In-process cache: each endpoint is fetched at most once per DataFetcher
+    # (the disk cache behind _fetch_* covers repeated runs). The result is kept
+    # in the instance __dict__ rather than through functools.cached_property,
+    # whose class-wide lock (Python <= 3.11) would serialize every instance.
+    def _memo(self, name: str, fetch):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            value = self.__dict__[name] = fetch()
+            return value
+
+    @property
+    def income(self) -> pd.DataFrame:
+        return self._memo("income", self._fetch_income)
+
+    @property
+    def balance(self) -> pd.DataFrame:
+        return self._memo("balance", self._fetch_balance)
+
+    @property
+    def cashflow(self) -> pd.DataFrame:
+        return self._memo("cashflow", self._fetch_cashflow)
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        return self._memo("info", self._fetch_info)
+
+    def get_income(self) -> pd.DataFrame:
+        return self.income
+
     def get_balance(self) -> pd.DataFrame:
-        for name in ("balance_sheet", "get_balance_sheet", "balance"):
-            df = self._safe_df(name)
-            if not df.empty:
-                return df
-        return pd.DataFrame()
+        return self.balance
 
     def get_cashflow(self) -> pd.DataFrame:
-        for name in ("cashflow", "get_cashflow"):
-            df = self._safe_df(name)
-            if not df.empty:
-                return df
-        return pd.DataFrame()
+        return self.cashflow
 
     def get_quarterly_income(self) -> pd.DataFrame:
         try:
-            df = self.asset.quarterly_financials.T
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                return df.sort_index()
-        except Exception:
-            pass
-        return pd.DataFrame()
+            df = self.asset.quarterly_financials
+        except FETCH_ERRORS as e:
+            logger.warning("%s: quarterly_financials failed: %s", self.ticker_str, e)
+            return pd.DataFrame()
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return pd.DataFrame()
+        return _chronological(df.T)
 
     def get_info(self) -> Dict[str, Any]:
-        try:
-            info = self.asset.info or {}
-            return info
-        except Exception:
-            return {}
+        return self.info
 
     def validate_ticker(self) -> bool:
         """A basic validation: does asset have a marketCap or currentPrice?"""
-        info = self.get_info()
+        # reuse the full info if already fetched, otherwise fast_info avoids the scrape
+        info = self.__dict__.get("info") or self._fast_info(("marketCap", "currentPrice"))
         return bool(info.get("marketCap") or info.get("currentPrice"))
@@ -3,12 +3,17 @@
 Discounted Cash Flow implementations:
 - simple 1-phase perpetuity DCF
 - 2-phase DCF with explicit forecast years then terminal value (Gordon growth)
+- array versions of both for sensitivity / Monte Carlo scans
 Also contains a simple WACC estimator and helper utilities.
 """
 
 from typing import Optional, List
 import math
 
+import numpy as np
+
+from jit_utils import njit, prange, HAS_NUMBA
+
 
 def estimate_wacc(info: dict, rf: float = 0.03, market_premium: float = 0.055, tax_rate: float = 0.25) -> Optional[float]:
     """
@@ -18,14 +23,15 @@ def estimate_wacc(info: dict, rf: float = 0.03, market_premium: float = 0.055, t
     - weights from marketCap and netDebt
     """
     try:
-        beta = info.get("beta") or 1.0
-        market_cap = info.get("marketCap")
-        total_debt = info.get("totalDebt") or info.get("totalDebt") or 0
-        cash = info.get("cash") or info.get("totalCash") or 0
-        net_debt = max(0, (total_debt or 0) - (cash or 0))
+        get = info.get
+        beta = get("beta") or 1.0
+        market_cap = get("marketCap")
+        total_debt = get("totalDebt") or get("totalDebtLongTerm") or 0
+        cash = get("cash") or get("totalCash") or 0
+        cost_of_debt = get("interestRate") or 0.04  # fallback
 
+        net_debt = max(0, total_debt - cash)
         cost_of_equity = rf + float(beta) * market_premium
-        cost_of_debt = info.get("interestRate") or 0.04  # fallback
         # after-tax cost of debt
         kd = float(cost_of_debt) * (1 - tax_rate)
 
@@ -64,6 +70,34 @@ def dcf_one_stage(fcf_now: float, growth: float, wacc: float) -> Optional[float]
     return fcf1 / denom
 
 
+# Numeric kernels (numba-compiled when available). Callers check wacc > terminal growth.
+
+@njit(fastmath=True)
+def _dcf_two_stage_kernel(initial_fcf: float, growths, terminal_growth: float, wacc: float) -> float:
+    """PV of the forecast cash flows plus the discounted Gordon terminal value, in one pass."""
+    fcf = initial_fcf
+    discount = 1.0
+    pv = 0.0
+    for g in growths:
+        fcf *= 1.0 + g
+        discount *= 1.0 + wacc
+        pv += fcf / discount
+    return pv + fcf * (1.0 + terminal_growth) / (wacc - terminal_growth) / discount
+
+
+@njit(parallel=True)
+def _dcf_two_stage_batch_kernel(initial_fcf: float, growths, terminal_growth, wacc):
+    """Row-wise _dcf_two_stage_kernel over (m, n) growths and (m,) rates; NaN where wacc <= g."""
+    m = growths.shape[0]
+    out = np.empty(m)
+    for i in prange(m):
+        if wacc[i] - terminal_growth[i] <= 0.0:
+            out[i] = np.nan
+        else:
+            out[i] = _dcf_two_stage_kernel(initial_fcf, growths[i], terminal_growth[i], wacc[i])
+    return out
+
+
 def dcf_two_stage(initial_fcf: float, forecast_growths: List[float], terminal_growth: float, wacc: float) -> Optional[float]:
     """
     Two-stage DCF:
@@ -74,20 +108,81 @@ def dcf_two_stage(initial_fcf: float, forecast_growths: List[float], terminal_gr
     """
     if initial_fcf is None or wacc is None or not forecast_growths:
         return None
-    fcf = float(initial_fcf)
-    pv = 0.0
-    for i, g in enumerate(forecast_growths, start=1):
-        fcf = fcf * (1 + g)
-        pv += fcf / ((1 + wacc) ** i)
+    if (wacc - terminal_growth) <= 0:
+        return None
+    if HAS_NUMBA:
+        return float(_dcf_two_stage_kernel(float(initial_fcf),
+                                           np.asarray(forecast_growths, dtype=np.float64),
+                                           float(terminal_growth), float(wacc)))
+    n = len(forecast_growths)
+    if n <= 3:
+        # short horizons: the plain loop beats NumPy's call overhead
+        fcf = float(initial_fcf)
+        pv = 0.0
+        for i, g in enumerate(forecast_growths, start=1):
+            fcf = fcf * (1 + g)
+            pv += fcf / ((1 + wacc) ** i)
+        discount_n = (1 + wacc) ** n
+    else:
+        g = np.asarray(forecast_growths, dtype=np.float64)
+        fcfs = float(initial_fcf) * np.cumprod(1.0 + g)
+        discounts = (1.0 + wacc) ** np.arange(1, n + 1)
+        pv = float((fcfs / discounts).sum())
+        fcf = float(fcfs[-1])
+        discount_n = float(discounts[-1])
     # terminal value at year n
     terminal_fcf = fcf * (1 + terminal_growth)
-    terminal_value = terminal_fcf / (wacc - terminal_growth) if (wacc - terminal_growth) > 0 else None
-    if terminal_value is None:
-        return None
-    pv += terminal_value / ((1 + wacc) ** len(forecast_growths))
+    terminal_value = terminal_fcf / (wacc - terminal_growth)
+    pv += terminal_value / discount_n
     return pv
 
 
+def dcf_one_stage_vec(fcf_now: float, growth, wacc) -> np.ndarray:
+    """
+    Vectorized dcf_one_stage for sensitivity scans: `growth` and `wacc` are arrays
+    (or scalars) broadcast against each other. Entries with wacc <= growth are NaN.
+    """
+    g = np.asarray(growth, dtype=np.float64)
+    w = np.asarray(wacc, dtype=np.float64)
+    denom = w - g
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = float(fcf_now) * (1.0 + g) / denom
+    return np.where(denom > 0, out, np.nan)
+
+
+def dcf_two_stage_vec(initial_fcf: float, forecast_growths, terminal_growth, wacc) -> np.ndarray:
+    """
+    Vectorized dcf_two_stage over m scenarios.
+    - forecast_growths: shape (n,) shared by all scenarios, or (m, n) one path per scenario
+    - terminal_growth, wacc: scalars or shape (m,)
+    Returns shape (m,) enterprise values; NaN where wacc <= terminal_growth.
+    """
+    g = np.atleast_2d(np.asarray(forecast_growths, dtype=np.float64))
+    w = np.asarray(wacc, dtype=np.float64).reshape(-1, 1)
+    tg = np.asarray(terminal_growth, dtype=np.float64).reshape(-1)
+    n = g.shape[1]
+    if n == 0:
+        return np.full(np.broadcast(w[:, 0], tg).shape, np.nan)
+
+    if HAS_NUMBA:
+        m = np.broadcast(g[:, 0], w[:, 0], tg).shape[0]
+        return _dcf_two_stage_batch_kernel(
+            float(initial_fcf),
+            np.ascontiguousarray(np.broadcast_to(g, (m, n))),
+            np.ascontiguousarray(np.broadcast_to(tg, (m,))),
+            np.ascontiguousarray(np.broadcast_to(w[:, 0], (m,))),
+        )
+
+    fcfs = float(initial_fcf) * np.cumprod(1.0 + g, axis=1)
+    discounts = (1.0 + w) ** np.arange(1, n + 1)
+    pv = (fcfs / discounts).sum(axis=1)
+    denom = w[:, 0] - tg
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = fcfs[:, -1] * (1.0 + tg) / denom
+    pv = pv + terminal_value / discounts[:, -1]
+    return np.where(denom > 0, pv, np.nan)
+
+
 def intrinsic_value_per_share_from_ev(ev: float, info: dict) -> Optional[float]:
     """
     Convert enterprise value to per-share intrinsic price.
@@ -7,8 +7,65 @@ Module: fundamental_analysis
 Processes raw financial data to compute fundamental indicators.
 """
 
+from dataclasses import dataclass
+from typing import Optional
+
 import numpy as np
 
+from valuation import base_multiples
+
+
+def _to_float(x) -> Optional[float]:
+    try:
+        return float(x) if x is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class Fundamentals:
+    """Numeric fields extracted once from a yfinance `info` dict (None when unavailable)."""
+
+    pe: Optional[float] = None
+    pb: Optional[float] = None
+    ps: Optional[float] = None
+    ev_ebitda: Optional[float] = None
+    pfcf: Optional[float] = None
+    op_margin: Optional[float] = None
+    net_margin: Optional[float] = None
+    roe: Optional[float] = None
+    roa: Optional[float] = None
+    debt_eq: Optional[float] = None
+    current_ratio: Optional[float] = None
+    book_value: Optional[float] = None
+    eps: Optional[float] = None
+    shares: Optional[float] = None
+    price: Optional[float] = None
+
+    @classmethod
+    def from_info(cls, info: dict) -> "Fundamentals":
+        """Read every needed `info` key once; multiples come from valuation.base_multiples."""
+        get = info.get
+        multiples = base_multiples(info)
+        return cls(
+            pe=_to_float(multiples["PE"]),
+            pb=_to_float(multiples["PB"]),
+            ps=_to_float(multiples["PS"]),
+            ev_ebitda=_to_float(multiples["EV/EBITDA"]),
+            pfcf=_to_float(multiples["P/FCF"]),
+            op_margin=_to_float(get("operatingMargins")),
+            net_margin=_to_float(get("profitMargins")),
+            roe=_to_float(get("returnOnEquity")),
+            roa=_to_float(get("returnOnAssets")),
+            debt_eq=_to_float(get("debtToEquity")),
+            current_ratio=_to_float(get("currentRatio")),
+            book_value=_to_float(get("bookValue")),
+            eps=_to_float(get("trailingEps")),
+            shares=_to_float(get("sharesOutstanding")),
+            price=_to_float(get("currentPrice")),
+        )
+
+
 class FundamentalAnalysis:
     """Computes fundamental ratios and growth metrics from financial statements."""
 
@@ -17,46 +74,63 @@ class FundamentalAnalysis:
         self.balance = balance_df
         self.cashflow = cashflow_df
         self.info = info
+        self.fundamentals = Fundamentals.from_info(info or {})
+        # growth inputs extracted once; None when the column is missing
+        self._rev_arr = self._column_array("Total Revenue")
+        self._ni_arr = self._column_array("Net Income")
 
     # ------------- Growth Analysis -------------
-    def compute_revenue_growth(self):
-        if self.income.empty or "Total Revenue" not in self.income:
+    def _column_array(self, column: str) -> Optional[np.ndarray]:
+        """Income column as float64 ndarray, or None if the statement lacks it."""
+        if self.income is None or self.income.empty or column not in self.income.columns:
             return None
-        return self.income["Total Revenue"].pct_change().mean() * 100
+        return self.income[column].to_numpy(dtype=np.float64)
 
-    def compute_net_income_growth(self):
-        if self.income.empty or "Net Income" not in self.income:
+    @staticmethod
+    def _mean_growth(arr: Optional[np.ndarray]):
+        """Mean period-over-period growth (%) of a raw array."""
+        if arr is None or len(arr) < 2:
             return None
-        return self.income["Net Income"].pct_change().mean() * 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes = arr[1:] / arr[:-1] - 1.0
+        if np.isnan(changes).all():
+            return None
+        return float(np.nanmean(changes)) * 100
+
+    def compute_revenue_growth(self):
+        return self._mean_growth(self._rev_arr)
+
+    def compute_net_income_growth(self):
+        return self._mean_growth(self._ni_arr)
 
     # ------------- Profitability -------------
     def get_operating_margin(self):
-        return self.info.get("operatingMargins", None)
+        return self.fundamentals.op_margin
 
     def get_net_margin(self):
-        return self.info.get("profitMargins", None)
+        return self.fundamentals.net_margin
 
     def get_roe(self):
-        return self.info.get("returnOnEquity", None)
+        return self.fundamentals.roe
 
     def get_roa(self):
-        return self.info.get("returnOnAssets", None)
+        return self.fundamentals.roa
 
     # ------------- Financial Health -------------
     def get_debt_to_equity(self):
-        return self.info.get("debtToEquity", None)
+        return self.fundamentals.debt_eq
 
     def get_current_ratio(self):
-        return self.info.get("currentRatio", None)
+        return self.fundamentals.current_ratio
 
     # ------------- Valuation -------------
     def get_pe_ratio(self):
-        return self.info.get("trailingPE", None)
+        return self.fundamentals.pe
 
     def get_price_to_book(self):
-        return self.info.get("priceToBook", None)
+        return self.fundamentals.pb
 
     def get_price_to_sales(self):
-        return self.info.get("priceToSalesTrailing12Months", None)
+        return self.fundamentals.ps
 
 
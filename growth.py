@@ -6,57 +6,73 @@ in a robust way using the income DataFrame returned by DataFetcher.
 
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Final, Tuple, FrozenSet
 
 
-def pct_mean(series: pd.Series, periods: int = None) -> Optional[float]:
+def pct_mean(arr: np.ndarray, periods: int = None) -> Optional[float]:
     """
     Compute average annual growth rate (simple arithmetic mean of yearly pct_change).
     Returns percentage (e.g. 8.5 for 8.5%).
     """
-    if series is None or series.empty:
+    if arr is None or arr.size == 0:
         return None
-    try:
-        # drop zeros and NaNs to avoid infinite pct_change
-        s = series.replace([0], np.nan).dropna()
-        if s.shape[0] < 2:
-            return None
-        changes = s.pct_change().dropna()
-        if changes.empty:
-            return None
-        # optionally limit to the most recent `periods` years
-        if periods:
-            changes = changes.tail(periods)
-        return float(changes.mean() * 100)
-    except Exception:
+    # drop zeros to avoid infinite changes (NaNs are already gone)
+    arr = arr[arr != 0]
+    if arr.size < 2:
         return None
+    changes = arr[1:] / arr[:-1] - 1.0
+    # optionally limit to the most recent `periods` years
+    if periods:
+        changes = changes[-periods:]
+    return float(changes.mean() * 100)
 
 
-def get_revenue_series(income_df: pd.DataFrame) -> pd.Series:
-    """Try several common revenue column names used by yfinance."""
+# candidate column names, in order of preference
+_REV_NAMES: Final[Tuple[str, ...]] = ("Total Revenue", "Revenue", "totalRevenue", "Net Sales", "Revenues")
+_REV_SET: Final[FrozenSet[str]] = frozenset(_REV_NAMES)
+_NI_NAMES: Final[Tuple[str, ...]] = ("Net Income", "Net Income Common Stocks", "netIncome",
+                                     "Net Income Applicable To Common Shares")
+_NI_SET: Final[FrozenSet[str]] = frozenset(_NI_NAMES)
+
+
+_EMPTY = np.empty(0, dtype=np.float64)
+
+
+def _finite(col: pd.Series) -> np.ndarray:
+    """Column as a float64 array with NaN/inf dropped; empty if it is not numeric."""
+    try:
+        arr = col.to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        return _EMPTY
+    return arr[np.isfinite(arr)]
+
+
+def _find_series(income_df: pd.DataFrame, names: Tuple[str, ...], name_set: FrozenSet[str],
+                 numeric_fallback: int) -> np.ndarray:
+    """First column of `names` present in income_df, else the numeric column at `numeric_fallback`."""
     if income_df is None or income_df.empty:
-        return pd.Series(dtype=float)
-    for name in ["Total Revenue", "Revenue", "totalRevenue", "Net Sales", "Revenues"]:
-        if name in income_df.columns:
-            return income_df[name].dropna()
-    # fallback: try first numeric column
-    numeric_cols = [c for c in income_df.columns if pd.api.types.is_numeric_dtype(income_df[c])]
-    if numeric_cols:
-        return income_df[numeric_cols[0]].dropna()
-    return pd.Series(dtype=float)
-
-
-def get_net_income_series(income_df: pd.DataFrame) -> pd.Series:
+        return _EMPTY
+    present = name_set.intersection(income_df.columns)
+    if present:
+        for name in names:
+            if name in present:
+                return _finite(income_df[name])
+    numeric_cols = income_df.select_dtypes(include="number").columns
+    if len(numeric_cols):
+        return _finite(income_df[numeric_cols[numeric_fallback]])
+    return _EMPTY
+
+
+def get_revenue_series(income_df: pd.DataFrame) -> np.ndarray:
+    """Try several common revenue column names used by yfinance."""
+    # fallback: first numeric column
+    return _find_series(income_df, _REV_NAMES, _REV_SET, 0)
+
+
+def get_net_income_series(income_df: pd.DataFrame) -> np.ndarray:
     """Try several common net income column names."""
-    if income_df is None or income_df.empty:
-        return pd.Series(dtype=float)
-    for name in ["Net Income", "Net Income Common Stocks", "netIncome", "Net Income Applicable To Common Shares"]:
-        if name in income_df.columns:
-            return income_df[name].dropna()
-    numeric_cols = [c for c in income_df.columns if pd.api.types.is_numeric_dtype(income_df[c])]
-    if numeric_cols:
-        return income_df[numeric_cols[-1]].dropna()  # last numeric column often net income
-    return pd.Series(dtype=float)
+    # fallback: last numeric column often net income
+    return _find_series(income_df, _NI_NAMES, _NI_SET, -1)
 
 
 def compute_revenue_growth(income_df: pd.DataFrame, years: int = 5) -> Optional[float]:
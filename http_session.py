@@ -0,0 +1,42 @@
+# http_session.py
+"""
+Shared HTTP session for the raw Yahoo Finance calls (autocomplete, spark quotes).
+One keep-alive connection pool per process avoids paying TCP + TLS setup on
+every request.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# distinct hosts kept alive / connections per host (sized for the 20-worker fetch pools)
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
+# Retry dropped connections and transient Yahoo 5xx errors quickly. Read timeouts
+# are not retried, so a slow endpoint costs one timeout; 429 (rate limited) is not
+# retried either, since re-sending right away only prolongs the throttle.
+RETRY = Retry(
+    total=2,
+    connect=2,
+    read=0,
+    backoff_factor=0.2,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                          max_retries=RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Yahoo rejects the default python-requests user agent on some endpoints
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    return session
+
+
+SESSION = _build_session()
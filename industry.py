@@ -2,51 +2,64 @@
 """
 Simple helper to compute industry/peer medians for multiples.
 You must provide a list of peer tickers (strings). This module will fetch `info` for each peer
-(using yfinance) and compute medians for the requested multiple keys.
+(through DataFetcher, so it shares its yf.Ticker objects and endpoint cache)
+and compute medians for the requested multiple keys.
 """
 
-import yfinance as yf
-from typing import List, Dict
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 import numpy as np
 
+from data_fetcher import DataFetcher
+from fundamental_analysis import Fundamentals
 
-def peers_median(peers: List[str], keys: List[str]) -> Dict[str, float]:
+
+# peers_median key -> Fundamentals attribute
+PEER_FIELDS = {
+    "PE": "pe",
+    "PB": "pb",
+    "PS": "ps",
+    "EV/EBITDA": "ev_ebitda",
+    "P/FCF": "pfcf",
+}
+
+MAX_WORKERS = 16
+
+
+def _fetch_peer_info(ticker: str, session=None) -> Optional[Fundamentals]:
+    """Fundamentals for one peer, None on failure so one bad ticker does not fail the batch."""
+    try:
+        info = DataFetcher(ticker, prefetch=False, session=session).get_info()
+        return Fundamentals.from_info(info) if info else None
+    except Exception:
+        return None
+
+
+def peers_median(peers: List[str], keys: List[str], session=None) -> Dict[str, float]:
     """
     peers: list of tickers, keys: list of multiple keys e.g. ["PE", "PB", "EV/EBITDA"]
+    session: optional HTTP session passed to yf.Ticker for the peers
     Returns dict key->median (None if cannot compute).
     """
-    results = {k: [] for k in keys}
-    for t in peers:
-        try:
-            asset = yf.Ticker(t)
-            info = asset.info or {}
-            # map keys to info fields
-            mapping = {
-                "PE": info.get("trailingPE") or info.get("forwardPE"),
-                "PB": info.get("priceToBook"),
-                "PS": info.get("priceToSalesTrailing12Months"),
-                "EV/EBITDA": None
-            }
-            # compute EV/EBITDA
-            market_cap = info.get("marketCap")
-            total_debt = info.get("totalDebt") or 0
-            cash = info.get("totalCash") or 0
-            ebitda = info.get("ebitda")
-            if market_cap and ebitda and ebitda != 0:
-                mapping["EV/EBITDA"] = (market_cap + (total_debt or 0) - (cash or 0)) / ebitda
-            for k in keys:
-                v = mapping.get(k)
-                if v is not None:
-                    try:
-                        results[k].append(float(v))
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-    medians = {}
-    for k, arr in results.items():
-        if arr:
-            medians[k] = float(np.median(arr))
-        else:
-            medians[k] = None
-    return medians
+    fundamentals = []
+    if peers:
+        # one blocking info request per distinct peer: fan them out
+        unique = list(dict.fromkeys(peers))
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(unique))) as ex:
+            by_ticker = dict(zip(unique, ex.map(lambda t: _fetch_peer_info(t, session), unique)))
+        fundamentals = [f for f in (by_ticker[t] for t in peers) if f is not None]
+
+    if not fundamentals:
+        return {k: None for k in keys}
+
+    # (n_keys, n_peers) matrix, NaN where a peer lacks a value or the key is unknown
+    mat = np.full((len(keys), len(fundamentals)), np.nan)
+    for i, k in enumerate(keys):
+        attr = PEER_FIELDS.get(k)
+        if attr is not None:
+            mat[i] = np.array([getattr(f, attr) for f in fundamentals], dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        med = np.nanmedian(mat, axis=1)
+    return {k: (None if np.isnan(med[i]) else float(med[i])) for i, k in enumerate(keys)}
@@ -0,0 +1,29 @@
+# jit_utils.py
+"""
+Optional Numba support.
+`njit` is numba.njit(cache=True) when numba is installed, otherwise a no-op
+decorator, so the numeric kernels run as plain Python without numba.
+`prange` is numba.prange for parallel kernels, or plain `range`.
+"""
+
+try:
+    from numba import njit as _numba_njit, prange
+    HAS_NUMBA = True
+except Exception:
+    _numba_njit = None
+    prange = range
+    HAS_NUMBA = False
+
+
+def njit(fn=None, **kwargs):
+    """Decorate a numeric kernel with numba.njit(cache=True) if available."""
+    def decorator(f):
+        if not HAS_NUMBA:
+            return f
+        options = {"cache": True}
+        options.update(kwargs)
+        return _numba_njit(**options)(f)
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
@@ -4,31 +4,83 @@ Main CLI orchestrator for FondaWork (Option 3).
 Handles: ticker resolution, data fetch, fundamentals, valuation, ratings, peers.
 """
 
-from data_fetcher import DataFetcher
-from growth import compute_revenue_growth, compute_net_income_growth
-from profitability import (
-    compute_operating_margin, compute_net_margin,
-    compute_roic, compute_roe, compute_roa
-)
-from valuation import consolidate_valuation, safe_intrinsic_price
-from rating_engine import RatingEngine
-from ticker_resolver import TickerResolver
-from industry import peers_median
-
+import importlib
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+# The analysis modules pull in yfinance/pandas/numpy, so they are imported inside
+# run(); library users can still do `from main import DataFetcher` (PEP 562).
+_LAZY_IMPORTS = {
+    "DataFetcher": "data_fetcher",
+    "compute_revenue_growth": "growth",
+    "compute_net_income_growth": "growth",
+    "compute_operating_margin": "profitability",
+    "compute_net_margin": "profitability",
+    "compute_roic": "profitability",
+    "compute_roe": "profitability",
+    "compute_roa": "profitability",
+    "consolidate_valuation": "valuation",
+    "safe_intrinsic_price": "valuation",
+    "RatingEngine": "rating_engine",
+    "RATE_GROWTH": "rating_engine",
+    "RATE_MARGIN": "rating_engine",
+    "RATE_ROIC": "rating_engine",
+    "TickerResolver": "ticker_resolver",
+    "peers_median": "industry",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+# cash-flow statement column candidates, in order of preference
+_FCF_KEYS: Final[Tuple[str, ...]] = ("Free Cash Flow", "FreeCashFlow", "freeCashflow")
+_CFO_KEYS: Final[Tuple[str, ...]] = ("Total Cash From Operating Activities", "Operating Cash Flow",
+                                     "cashFlowFromOperations")
+_CAPEX_KEYS: Final[Tuple[str, ...]] = ("Capital Expenditures", "capitalExpenditures", "Capex")
+
+
+def _last(df, keys):
+    """Latest non-null value of the first column of `keys` that has one, else None."""
+    cols = frozenset(keys).intersection(df.columns)
+    for k in keys:
+        if k in cols:
+            try:
+                arr = df[k].to_numpy(dtype=float)
+            except (TypeError, ValueError):
+                continue
+            arr = arr[arr == arr]  # drop NaN without a pandas copy
+            if arr.size:
+                return float(arr[-1])
+    return None
+
 
 def fmt(x):
     """Format floats to 2 decimals."""
     try:
-        return f"{float(x):.2f}"
-    except:
+        # skip the float() round-trip for values that are already floats
+        return format(x if isinstance(x, float) else float(x), ".2f")
+    except (TypeError, ValueError):
         return str(x)
 
 def fmt_pct(x):
     """Format percent values: 12.34%."""
     try:
-        return f"{float(x):.2f}%"
-    except:
+        return format(x if isinstance(x, float) else float(x), ".2f") + "%"
+    except (TypeError, ValueError):
         return str(x)
 
 
@@ -36,7 +88,62 @@ def format_pct(x):
     return f"{x:.2f}%" if isinstance(x, float) else str(x)
 
 
+def fmt_ratio_pct(x):
+    """Format a decimal ratio (0.12) as a percent (12.00%), N/A when missing."""
+    return fmt_pct(x * 100) if x else "N/A"
+
+
+def dump_json(obj) -> str:
+    """Indented JSON for the report; orjson when installed (NaN becomes null there)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, indent=2)
+
+
+def build_report(ticker, indicators, ratings, score, val, safe_fair, safe_entry,
+                 current_price, peer_medians=None) -> str:
+    """
+    Assemble the full text report.
+    indicators: iterable of (label, value, formatter) tuples.
+    peer_medians: dict, or None to omit the peer section.
+    """
+    lines = [
+        f"\nFundamental & Valuation Report for {ticker}",
+        "=" * 60,
+        "\n-- Key Indicators --",
+    ]
+    lines.extend(f"{label}: {formatter(value)}" for label, value, formatter in indicators)
+
+    lines.append("\n-- Ratings --")
+    lines.extend(f"{k}: {v}" for k, v in ratings.items())
+    lines.append(f"\nGlobal Score: {score}/100")
+
+    lines.append("\n-- Valuation --")
+    lines.append(f"WACC used: {fmt_ratio_pct(val.get('wacc'))}")
+    lines.extend(f"{k}: {fmt(v)}" for k, v in val.get("multiples", {}).items())
+    lines.append(f"Fair value (combined): {safe_fair}")
+    lines.append(f"Entry price (20% safety margin): {safe_entry}")
+    lines.append(f"Current market price: {current_price}")
+
+    if peer_medians is not None:
+        lines.append("\n-- Peer Medians --")
+        lines.append(dump_json(peer_medians))
+
+    return "\n".join(lines)
+
+
 def run():
+    from data_fetcher import DataFetcher
+    from growth import compute_revenue_growth, compute_net_income_growth
+    from profitability import (
+        compute_operating_margin, compute_net_margin,
+        compute_roic, compute_roe, compute_roa
+    )
+    from valuation import consolidate_valuation, safe_intrinsic_price
+    from rating_engine import RatingEngine, RATE_GROWTH, RATE_MARGIN, RATE_ROIC, GOOD, WEAK
+    from ticker_resolver import TickerResolver
+    from industry import peers_median
+
     # -----------------------------
     # 1) Resolve ticker
     # -----------------------------
@@ -49,6 +156,8 @@ def run():
     # -----------------------------
     # 2) Fetch market data
     # -----------------------------
+    # DataFetcher fetches income/balance/cashflow/info concurrently on construction;
+    # the getters below only read the results.
     fetcher = DataFetcher(ticker)
 
     if not fetcher.validate_ticker():
@@ -59,6 +168,9 @@ def run():
     balance = fetcher.get_balance()
     cash = fetcher.get_cashflow()
     info = fetcher.get_info()
+    # info fields used directly by the report, read once
+    debt_to_equity = info.get("debtToEquity")
+    current_price = info.get("currentPrice")
 
     # -----------------------------
     # 3) Growth metrics
@@ -81,40 +193,12 @@ def run():
     fcf = None
     try:
         if not cash.empty:
-            # Direct FCF keys
-            for col in ["Free Cash Flow", "FreeCashFlow", "freeCashflow"]:
-                if col in cash.columns and not cash[col].dropna().empty:
-                    fcf = float(cash[col].dropna().iloc[-1])
-                    break
-
-            # Fallback CFO - Capex
+            # Direct FCF keys, else fallback CFO - Capex
+            fcf = _last(cash, _FCF_KEYS)
             if fcf is None:
-                cfo_keys = [
-                    "Total Cash From Operating Activities",
-                    "Operating Cash Flow",
-                    "cashFlowFromOperations"
-                ]
-                capex_keys = [
-                    "Capital Expenditures",
-                    "capitalExpenditures",
-                    "Capex"
-                ]
-
-                cfo = None
-                capex = None
-
-                for k in cfo_keys:
-                    if k in cash.columns and not cash[k].dropna().empty:
-                        cfo = float(cash[k].dropna().iloc[-1])
-                        break
-
-                for k in capex_keys:
-                    if k in cash.columns and not cash[k].dropna().empty:
-                        capex = float(cash[k].dropna().iloc[-1])
-                        break
-
+                cfo = _last(cash, _CFO_KEYS)
                 if cfo is not None:
-                    fcf = cfo - (capex or 0)
+                    fcf = cfo - (_last(cash, _CAPEX_KEYS) or 0)
     except Exception:
         fcf = None
 
@@ -124,12 +208,16 @@ def run():
     peer_input = input("Optional: enter comma-separated peer tickers for industry comparison (or press Enter): ").strip()
 
     raw_peers = [p.strip() for p in peer_input.split(',')] if peer_input else []
+    # drop repeated names so each is resolved (and fetched) once
+    raw_peers = list(dict.fromkeys(raw_peers))
     peers = []
 
-    for p in raw_peers:
+    # resolve all peers concurrently (each miss is a Yahoo autocomplete round-trip)
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(raw_peers)))) as ex:
+        futures = [(p, ex.submit(resolver.resolve, p)) for p in raw_peers]
+    for p, future in futures:
         try:
-            resolved = resolver.resolve(p)
-            peers.append(resolved)
+            peers.append(future.result())
         except Exception:
             print(f"Warning: could not resolve peer '{p}'. Skipping.")
 
@@ -150,11 +238,11 @@ def run():
     # 8) Ratings
     # -----------------------------
     ratings = {
-        "Revenue Growth": RatingEngine.rate_value(rev_growth, (0, 5)) if rev_growth is not None else "Data Unavailable",
-        "Net Income Growth": RatingEngine.rate_value(ni_growth, (0, 5)) if ni_growth is not None else "Data Unavailable",
-        "Operating Margin": RatingEngine.rate_value(op_margin * 100 if op_margin else None, (5, 15)),
-        "ROIC": RatingEngine.rate_value(roic * 100 if roic else None, (8, 12)),
-        "Debt/Equity": "Good" if info.get("debtToEquity") and info["debtToEquity"] < 100 else "Weak"
+        "Revenue Growth": RATE_GROWTH(rev_growth),
+        "Net Income Growth": RATE_GROWTH(ni_growth),
+        "Operating Margin": RATE_MARGIN(op_margin * 100 if op_margin else None),
+        "ROIC": RATE_ROIC(roic * 100 if roic else None),
+        "Debt/Equity": GOOD if debt_to_equity and debt_to_equity < 100 else WEAK
     }
 
     # Normalized 0–100 global score
@@ -163,47 +251,26 @@ def run():
     # -----------------------------
     # 9) Build final report
     # -----------------------------
-    report = []
-    report.append(f"\nFundamental & Valuation Report for {ticker}")
-    report.append("=" * 60)
-
-    report.append("\n-- Key Indicators --")
-    report.append(f"Revenue growth (5y avg): {fmt_pct(rev_growth)}")
-    report.append(f"Net income growth (5y avg): {fmt_pct(ni_growth)}")
-    report.append(f"Operating margin: {fmt_pct(op_margin * 100) if op_margin else 'N/A'}")
-    report.append(f"Net margin: {fmt_pct(net_margin * 100) if net_margin else 'N/A'}")
-    report.append(f"ROE: {fmt_pct(roe * 100) if roe else 'N/A'}")
-    report.append(f"ROA: {fmt_pct(roa * 100) if roa else 'N/A'}")
-    report.append(f"ROIC (estimated): {fmt_pct(roic * 100) if roic else 'N/A'}")
-    report.append(f"Debt/Equity: {fmt(info.get('debtToEquity'))}")
-    report.append(f"Free Cash Flow (latest): {fmt(fcf)}")
-
-
-    report.append("\n-- Ratings --")
-    for k, v in ratings.items():
-        report.append(f"{k}: {v}")
-
-    report.append(f"\nGlobal Score: {score}/100")
-
-    report.append("\n-- Valuation --")
-    report.append(f"WACC used: {fmt_pct(val.get('wacc') * 100) if val.get('wacc') else 'N/A'}")
-    for k, v in val.get("multiples", {}).items():
-        report.append(f"{k}: {fmt(v)}")
-    
+    indicators = (
+        ("Revenue growth (5y avg)", rev_growth, fmt_pct),
+        ("Net income growth (5y avg)", ni_growth, fmt_pct),
+        ("Operating margin", op_margin, fmt_ratio_pct),
+        ("Net margin", net_margin, fmt_ratio_pct),
+        ("ROE", roe, fmt_ratio_pct),
+        ("ROA", roa, fmt_ratio_pct),
+        ("ROIC (estimated)", roic, fmt_ratio_pct),
+        ("Debt/Equity", debt_to_equity, fmt),
+        ("Free Cash Flow (latest)", fcf, fmt),
+    )
+
     safe_fair, safe_entry = safe_intrinsic_price(info,
                                                 val.get("intrinsic_price"),
                                                 val.get("multiples", {}).get("fair_value"))
 
-    report.append(f"Fair value (combined): {safe_fair}")
-    report.append(f"Entry price (20% safety margin): {safe_entry}")
-    report.append(f"Current market price: {info.get('currentPrice')}")
-
-
-    if peers:
-        report.append("\n-- Peer Medians --")
-        report.append(json.dumps(peer_medians, indent=2))
-
-    print("\n".join(report))
+    report = build_report(ticker, indicators, ratings, score, val,
+                          safe_fair, safe_entry, current_price,
+                          peer_medians if peers else None)
+    sys.stdout.write(report + "\n")
 
 
 if __name__ == "__main__":
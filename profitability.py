@@ -4,17 +4,26 @@ Compute ROIC, NOPAT, margins and earnings quality indicators.
 ROIC calculation attempts to use operating income and invested capital from balance sheet.
 """
 
-from typing import Optional
+from typing import Dict, Mapping, Optional
 import pandas as pd
 import numpy as np
 
 
+def _first_present(labels: pd.Index, keys) -> Optional[str]:
+    """First of `keys` found in `labels`, resolved with one get_indexer call."""
+    keys = list(keys)
+    if not labels.is_unique:
+        # get_indexer needs unique labels
+        return next((k for k in keys if k in labels), None)
+    hit = np.flatnonzero(labels.get_indexer(keys) >= 0)
+    return keys[hit[0]] if hit.size else None
+
+
 def safe_get(series: pd.Series, keys):
     """Return first available column from keys in series (DataFrame)."""
-    for k in keys:
-        if k in series:
-            return series[k]
-    return None
+    labels = series.columns if isinstance(series, pd.DataFrame) else series.index
+    key = _first_present(labels, keys)
+    return series[key] if key is not None else None
 
 
 def compute_operating_margin(info: dict) -> Optional[float]:
@@ -38,79 +47,132 @@ def compute_roa(info: dict) -> Optional[float]:
     return float(val) if val is not None else None
 
 
-def compute_nopat_from_income(income_df: pd.DataFrame, tax_rate: float = 0.25) -> Optional[float]:
+def _latest_values(df: pd.DataFrame, columns) -> Dict[str, float]:
+    """Latest non-null value of each of `columns` present in df (one pass), by column name."""
+    if not df.columns.is_unique:
+        # get_indexer needs unique labels; keep the first of any repeated column
+        df = df.loc[:, ~df.columns.duplicated()]
+    columns = list(columns)
+    positions = df.columns.get_indexer(columns)
+    found = positions >= 0
+    present = [c for c, ok in zip(columns, found) if ok]
+    if not present:
+        return {}
+    sub = df.iloc[:, positions[found]]
+    try:
+        arr = sub.to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        arr = sub.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(arr)
+    # row of the last non-null value per column
+    rows = arr.shape[0] - 1 - valid[::-1].argmax(axis=0)
+    values = arr[rows, np.arange(arr.shape[1])]
+    return {c: float(values[i]) for i, c in enumerate(present) if valid[:, i].any()}
+
+
+def _latest_by_alias(df: pd.DataFrame, alias_groups) -> list:
     """
-    Estimate NOPAT from income statement: use 'Operating Income' or 'EBIT'.
-    Returns the most recent NOPAT (scalar).
+    Latest non-null value for each group of column aliases (the first alias that
+    has data wins), None where no alias has any. All columns are read in one pass.
     """
-    if income_df is None or income_df.empty:
+    latest = _latest_values(df, dict.fromkeys(a for group in alias_groups for a in group))
+    return [next((latest[k] for k in group if k in latest), None) for group in alias_groups]
+
+
+_OP_INCOME_COLS = ("Operating Income", "OperatingIncome", "operatingIncome", "EBIT", "Ebit")
+_ASSETS_COLS = ("Total Assets", "totalAssets", "Assets")
+_LIABILITIES_COLS = ("Total Current Liabilities", "Total Liab", "totalLiab")
+_CASH_COLS = ("Cash And Cash Equivalents", "Cash", "cash")
+
+
+# alias groups per extracted field, for _extract_latest
+_BALANCE_ALIASES = {"assets": _ASSETS_COLS, "liabilities": _LIABILITIES_COLS, "cash": _CASH_COLS}
+
+
+def _extract_latest(df: Optional[pd.DataFrame], alias_map) -> Dict[str, Optional[float]]:
+    """Latest value per field of `alias_map` (field -> column aliases), one pass over df."""
+    if df is None or df.empty:
+        return dict.fromkeys(alias_map)
+    return dict(zip(alias_map, _latest_by_alias(df, tuple(alias_map.values()))))
+
+
+def _invested_capital(assets: Optional[float], liabilities: Optional[float],
+                      cash: Optional[float]) -> Optional[float]:
+    if assets is None:
         return None
-    for col in ["Operating Income", "OperatingIncome", "operatingIncome", "EBIT", "Ebit"]:
-        if col in income_df.columns:
-            op_income = income_df[col].dropna()
-            if not op_income.empty:
-                # take most recent
-                ebit = float(op_income.iloc[-1])
-                return ebit * (1 - tax_rate)
+    if liabilities is None:
+        # fallback to totalDebt if present
+        return assets
+    invested = assets - liabilities - (cash or 0.0)
+    # invested should be positive: floor at half the assets
+    half_assets = assets * 0.5
+    return float(invested if invested > half_assets else half_assets)
+
+
+def compute_nopat_from_income(income_latest: Mapping[str, float], tax_rate: float = 0.25) -> Optional[float]:
+    """
+    Estimate NOPAT from the latest income-statement values (column name -> value,
+    e.g. from _latest_values): use 'Operating Income' or 'EBIT'.
+    A DataFrame is still accepted and goes through compute_nopat_from_income_df.
+    """
+    if income_latest is None:
+        return None
+    if isinstance(income_latest, pd.DataFrame):
+        return compute_nopat_from_income_df(income_latest, tax_rate)
+    for col in _OP_INCOME_COLS:
+        v = income_latest.get(col)
+        if v is not None and v == v:
+            return v * (1 - tax_rate)
     return None
 
 
+def compute_nopat_from_income_df(income_df: pd.DataFrame, tax_rate: float = 0.25) -> Optional[float]:
+    """compute_nopat_from_income on an income DataFrame; most recent NOPAT (scalar)."""
+    if income_df is None or income_df.empty:
+        return None
+    return compute_nopat_from_income(_latest_values(income_df, _OP_INCOME_COLS), tax_rate)
+
+
 def compute_invested_capital(balance_df: pd.DataFrame) -> Optional[float]:
     """
     Rough invested capital: total assets - current liabilities - excess cash.
     We try common names from balance sheet.
     """
-    if balance_df is None or balance_df.empty:
-        return None
-    # try for Total Assets
-    assets_cols = ["Total Assets", "totalAssets", "Assets"]
-    liabilities_cols = ["Total Current Liabilities", "Total Liab", "totalLiab"]
-    cash_keys = ["Cash And Cash Equivalents", "Cash", "cash"]
-
-    assets = None
-    liabilities = None
-    cash = 0.0
-
-    for k in assets_cols:
-        if k in balance_df.columns:
-            s = balance_df[k].dropna()
-            if not s.empty:
-                assets = float(s.iloc[-1])
-                break
-
-    for k in liabilities_cols:
-        if k in balance_df.columns:
-            s = balance_df[k].dropna()
-            if not s.empty:
-                liabilities = float(s.iloc[-1])
-                break
-
-    for k in cash_keys:
-        if k in balance_df.columns:
-            s = balance_df[k].dropna()
-            if not s.empty:
-                cash = float(s.iloc[-1])
-                break
+    return _invested_capital(**_extract_latest(balance_df, _BALANCE_ALIASES))
 
-    if assets is None:
-        return None
 
-    if liabilities is None:
-        # fallback to totalDebt if present
-        return assets
+def _eval(expr: str, frame: pd.DataFrame) -> pd.Series:
+    # numexpr fuses the arithmetic when installed; pandas' own engine otherwise
+    return pd.eval(expr, local_dict={c: frame[c] for c in frame.columns})
+
+
+def compute_invested_capital_batch(df_latest: pd.DataFrame) -> pd.Series:
+    """
+    compute_invested_capital for many tickers at once. df_latest has one row per
+    ticker and columns assets, liabilities, cash (latest values, NaN if missing).
+    """
+    latest = df_latest[["assets", "liabilities", "cash"]].astype(np.float64)
+    latest["cash"] = latest["cash"].fillna(0.0)
+    invested = _eval("assets - liabilities - cash", latest)
+    invested = invested.where(invested > latest["assets"] * 0.5, latest["assets"] * 0.5)
+    # no liabilities line: fall back to total assets, as the scalar version does
+    return invested.where(latest["liabilities"].notna(), latest["assets"])
+
+
+def compute_roic_batch(nopat: pd.Series, invested: pd.Series) -> pd.Series:
+    """ROIC per ticker from aligned NOPAT and invested-capital series; NaN where invested is 0."""
+    frame = pd.DataFrame({"nopat": nopat, "invested": invested.where(invested != 0)})
+    return _eval("nopat / invested", frame)
 
-    invested = assets - liabilities - cash
-    # invested should be positive
-    return float(max(invested, np.nanmean([assets, 0])))
-    
 
 def compute_roic(income_df, balance_df, info: dict, tax_rate: float = 0.25) -> Optional[float]:
     """
     Compute ROIC = NOPAT / Invested Capital. Both numerator and denominator estimated from statements.
     Returns decimal (e.g. 0.12 for 12%).
     """
-    nopat = compute_nopat_from_income(income_df, tax_rate=tax_rate)
-    invested = compute_invested_capital(balance_df)
+    # one columnar pass per statement
+    nopat = compute_nopat_from_income_df(income_df, tax_rate=tax_rate)
+    invested = _invested_capital(**_extract_latest(balance_df, _BALANCE_ALIASES))
     if nopat is None or invested is None or invested == 0:
         # fallback: try to use info fields if present
         roic_info = info.get("returnOnCapitalEmployed") or info.get("returnOnInvestedCapital")
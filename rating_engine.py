@@ -7,37 +7,170 @@ Encapsulates:
 - Textual verdict
 """
 
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Sequence
+import bisect
+import functools
+import sys
 import numpy as np
 
+from jit_utils import njit
+
+
+# Rating labels, interned so every rating shares one object per label
+GOOD = sys.intern("Good")
+AVERAGE = sys.intern("Average")
+WEAK = sys.intern("Weak")
+NA = sys.intern("Data Unavailable")
+
+
+# textual_verdict: a score at or above _VERDICT_CUTS[i] gets _VERDICTS[i + 1]
+_VERDICT_CUTS = (40.0, 60.0, 80.0)
+_VERDICTS = (
+    "Weak fundamentals — risky for long-term investment.",
+    "Mixed fundamentals — watch for risks.",
+    "Decent fundamentals — consider further due diligence.",
+    "Strong fundamentals — attractive for long-term investors.",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def make_rater(low: float, mid: float) -> Callable[[Optional[float]], str]:
+    """
+    Return rate_value specialized for fixed thresholds (low, mid), with the
+    thresholds bound in the closure. Identical pairs share one rater.
+    Expects a float or None (no string coercion, unlike rate_value).
+    """
+    def rate(value: Optional[float]) -> str:
+        if value is None or value != value:  # None or NaN
+            return NA
+        if value < low:
+            return WEAK
+        if value < mid:
+            return AVERAGE
+        return GOOD
+    return rate
+
+
+# Raters for the thresholds used by the CLI and the Streamlit app
+RATE_GROWTH = make_rater(0, 5)
+RATE_MARGIN = make_rater(5, 15)
+RATE_ROIC = make_rater(8, 12)
+
+
+@njit
+def _rate_and_score_kernel(values, lows, mids, weights):
+    """
+    Fused rate_values_vec + weighted score for one ticker: COLUMN_LABELS codes
+    per metric and the 0-100 score, in a single loop.
+    """
+    n = values.shape[0]
+    codes = np.empty(n, dtype=np.int8)
+    weighted = 0.0
+    total = 0.0
+    for i in range(n):
+        v = values[i]
+        total += weights[i]
+        if v != v:  # NaN
+            codes[i] = 0
+        elif v < lows[i]:
+            codes[i] = 1
+        elif v < mids[i]:
+            codes[i] = 2
+            weighted += 0.5 * weights[i]
+        else:
+            codes[i] = 3
+            weighted += weights[i]
+    score = weighted / total * 100.0 if total != 0.0 else 0.0
+    return codes, score
+
 
 class RatingEngine:
     """Encapsulated rating evaluator with static utility methods."""
 
     SCORE_MAP = {
-        "Good": 1.0,
-        "Average": 0.5,
-        "Weak": 0.0,
-        "Data Unavailable": 0.0
+        GOOD: 1.0,
+        AVERAGE: 0.5,
+        WEAK: 0.0,
+        NA: 0.0
     }
 
+    # label lookup for rate_column, indexed by 0=missing, 1=below low, 2=below mid, 3=otherwise
+    COLUMN_LABELS = np.array([NA, WEAK, AVERAGE, GOOD])
+    # the same codes: label -> code, and code -> SCORE_MAP value
+    LABEL_CODES = {label: code for code, label in enumerate(COLUMN_LABELS.tolist())}
+    _LABEL_TO_SCORE = np.array(list(map(SCORE_MAP.__getitem__, COLUMN_LABELS.tolist())))
+
     @staticmethod
     def rate_value(value: Optional[float], thresholds: tuple) -> str:
         """Rate a numeric value according to thresholds (low, mid)."""
-        if value is None or (isinstance(value, float) and np.isnan(value)):
-            return "Data Unavailable"
-
-        try:
-            v = float(value)
-        except Exception:
-            return "Data Unavailable"
+        if value is None:
+            return NA
+        t = type(value)
+        if t is float or t is int:
+            v = value
+        else:
+            try:
+                v = float(value)
+            except Exception:
+                return NA
+        if v != v:  # NaN
+            return NA
 
         low, mid = thresholds
         if v >= mid:
-            return "Good"
+            return GOOD
         elif v >= low:
-            return "Average"
-        return "Weak"
+            return AVERAGE
+        return WEAK
+
+    @classmethod
+    def rate_column(cls, values: Sequence[Optional[float]], low: float, mid: float) -> np.ndarray:
+        """
+        Vectorized rate_value: rate a whole column of values (e.g. one indicator
+        across many tickers) against the same (low, mid) thresholds in one pass.
+        None/NaN entries are rated "Data Unavailable".
+        """
+        v = np.asarray(values, dtype=np.float64)
+        codes = np.where(np.isnan(v), 0, np.where(v < low, 1, np.where(v < mid, 2, 3)))
+        return cls.COLUMN_LABELS[codes]
+
+    @classmethod
+    def rate_values_vec(cls, values: Sequence[Optional[float]], thresholds) -> np.ndarray:
+        """
+        Rate N different metrics at once, each against its own thresholds.
+        thresholds: (N, 2) array of (low, mid) rows aligned with `values`.
+        """
+        v = np.asarray(values, dtype=np.float64)
+        t = np.asarray(thresholds, dtype=np.float64).reshape(-1, 2)
+        codes = np.where(np.isnan(v), 0,
+                         np.where(v < t[:, 0], 1, np.where(v < t[:, 1], 2, 3)))
+        return cls.COLUMN_LABELS[codes]
+
+    @classmethod
+    def rate_and_score(cls, values: Sequence[Optional[float]], thresholds,
+                       weights=None):
+        """
+        Rate N metrics against their (N, 2) thresholds and score them in one pass
+        (numba-compiled when available). Returns (labels, 0-100 score).
+        """
+        v = np.asarray(values, dtype=np.float64)
+        t = np.asarray(thresholds, dtype=np.float64).reshape(-1, 2)
+        w = np.ones(v.shape[0]) if weights is None else np.asarray(weights, dtype=np.float64)
+        codes, score = _rate_and_score_kernel(v, np.ascontiguousarray(t[:, 0]),
+                                              np.ascontiguousarray(t[:, 1]), w)
+        return cls.COLUMN_LABELS[codes], round(float(score), 2)
+
+    @staticmethod
+    def compute_global_score_vec(score_matrix, weight_vec) -> np.ndarray:
+        """
+        Batched compute_global_score: score_matrix is (n_tickers, n_metrics) of
+        SCORE_MAP values, weight_vec the (n_metrics,) weights. Returns 0-100 scores.
+        """
+        w = np.asarray(weight_vec, dtype=np.float64)
+        total = w.sum()
+        if total == 0:
+            return np.zeros(np.shape(score_matrix)[0])
+        return np.round(np.asarray(score_matrix, dtype=np.float64) @ w / total * 100, 2)
 
     @staticmethod
     def compare_to_peer(value: Optional[float], peer_median: Optional[float]) -> Optional[str]:
@@ -75,13 +208,19 @@ class RatingEngine:
 
         return round((weighted / total_weight) * 100, 2)
 
+    @classmethod
+    def compute_global_score_from_codes(cls, codes, weights) -> float:
+        """
+        compute_global_score for ratings given as COLUMN_LABELS codes (e.g. from
+        rate_column / rate_values_vec via LABEL_CODES), with weights in the same order.
+        """
+        w = np.asarray(weights, dtype=np.float64)
+        total = w.sum()
+        if total == 0:
+            return 0.0
+        return round(float(cls._LABEL_TO_SCORE[np.asarray(codes, dtype=np.int8)] @ w) / total * 100, 2)
+
     @staticmethod
     def textual_verdict(score: float) -> str:
         """Text interpretation of the global weighted score."""
-        if score >= 80:
-            return "Strong fundamentals — attractive for long-term investors."
-        if score >= 60:
-            return "Decent fundamentals — consider further due diligence."
-        if score >= 40:
-            return "Mixed fundamentals — watch for risks."
-        return "Weak fundamentals — risky for long-term investment."
+        return _VERDICTS[bisect.bisect_right(_VERDICT_CUTS, score)]
@@ -7,35 +7,49 @@ Module: result_builder
 Formats the final output for the user (text, JSON, HTML, etc.).
 """
 
+import bisect
+import io
+from typing import Iterable, Iterator, Tuple
+
+# Verdict by global score (0-100 scale, as returned by compute_global_score)
+_VERDICT_CUTS = (30.0, 50.0)
+_VERDICTS = (
+    "Verdict: Weak fundamentals, high long‑term risk.",
+    "Verdict: Decent company but some weaknesses to watch.",
+    "Verdict: High‑quality company with strong long‑term outlook.",
+)
+
+
 class ResultBuilder:
     """Builds readable results for frontend or terminal display."""
 
     def build_text_report(self, ticker: str, indicators: dict, ratings: dict, score: int) -> str:
         """Return a fully formatted fundamental analysis text report."""
-        report = [
-            f"Fundamental Analysis Report for {ticker}",
-            "==========================================",
-            "",
-            "--- Raw Indicators ---",
-        ]
-
-        for key, val in indicators.items():
-            report.append(f"{key}: {val}")
-
-        report.append("\n--- Ratings ---")
-        for key, val in ratings.items():
-            report.append(f"{key}: {val}")
-
-        report.append("\n-- Global Rating --")
-        report.append(f"Score: {score:.1f} / 100")
-
-        if score >= 5:
-            report.append("Verdict: High‑quality company with strong long‑term outlook.")
-        elif score >= 3:
-            report.append("Verdict: Decent company but some weaknesses to watch.")
-        else:
-            report.append("Verdict: Weak fundamentals, high long‑term risk.")
-
-        return "\n".join(report)
-
-
+        return "\n".join(self._iter_lines(ticker, indicators, ratings, score))
+
+    def build_text_reports(self, reports: Iterable[Tuple[str, dict, dict, int]]) -> str:
+        """Concatenate the text reports for many (ticker, indicators, ratings, score) tuples."""
+        buf = io.StringIO()
+        for i, args in enumerate(reports):
+            if i:
+                buf.write("\n\n")
+            buf.write(self.build_text_report(*args))
+        return buf.getvalue()
+
+    @staticmethod
+    def _iter_lines(ticker: str, indicators: dict, ratings: dict, score: int) -> Iterator[str]:
+        yield f"Fundamental Analysis Report for {ticker}"
+        yield "=========================================="
+        yield ""
+        yield "--- Raw Indicators ---"
+        yield from (f"{key}: {val}" for key, val in indicators.items())
+
+        yield ""
+        yield "--- Ratings ---"
+        yield from (f"{key}: {val}" for key, val in ratings.items())
+
+        yield ""
+        yield "-- Global Rating --"
+        yield f"Score: {score:.1f} / 100"
+
+        yield _VERDICTS[bisect.bisect_right(_VERDICT_CUTS, score)]
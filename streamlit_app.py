@@ -4,6 +4,8 @@ Streamlit frontend for FondaWork — updated safe valuation & UI formatting.
 Run with: streamlit run streamlit_app.py
 """
 
+import asyncio
+
 import streamlit as st
 from typing import Tuple, Optional
 
@@ -12,9 +14,9 @@ from growth import compute_revenue_growth, compute_net_income_growth
 from profitability import compute_roic, compute_operating_margin, compute_net_margin
 from valuation import consolidate_valuation
 from industry import peers_median
-from rating_engine import RatingEngine
+from rating_engine import RatingEngine, RATE_GROWTH, RATE_MARGIN, RATE_ROIC
 from logging_config import setup_logging
-from ticker_resolver import TickerResolver
+from ticker_resolver import resolve_ticker, resolve_tickers_async
 
 # optionally import safe_intrinsic_price if present in valuation.py
 try:
@@ -22,7 +24,13 @@ try:
 except Exception:
     safe_intrinsic_price = None  # we'll use a fallback
 
-setup_logging()
+@st.cache_resource
+def _init_logging() -> bool:
+    """Configure logging once per process; Streamlit reruns the whole script."""
+    setup_logging()
+    return True
+
+_init_logging()
 
 # --- Streamlit Setup ---
 st.set_page_config(page_title='FondaWork', layout='centered')
@@ -32,9 +40,34 @@ st.markdown('Enter a company name (e.g. LVMH) or ticker (MC.PA, AAPL)')
 company = st.text_input('Company name or ticker', value='LVMH')
 peers_input = st.text_input('Optional: comma-separated peer tickers', value='')
 
+# cash-flow columns holding free cash flow directly, in order of preference
+FCF_COLUMNS = ("Free Cash Flow", "freeCashflow", "Free Cash Flow (TTM)")
+
 # -------------------------
 # Helpers
 # -------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_resolve(user_input: str) -> str:
+    """Ticker resolution that survives Streamlit reruns."""
+    return resolve_ticker(user_input)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _load_bundle(ticker: str) -> dict:
+    """All endpoints for a ticker, fetched once and reused across reruns."""
+    df = DataFetcher(ticker)
+    return {
+        "valid": df.validate_ticker(),
+        "info": df.get_info(),
+        "income": df.get_income(),
+        "balance": df.get_balance(),
+        "cash": df.get_cashflow(),
+    }
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_peers_median(peers: tuple, metrics: tuple) -> dict:
+    """peers_median keyed on hashable tuples so reruns reuse the result (pass peers sorted)."""
+    return peers_median(list(peers), list(metrics))
+
 def fmt(x) -> str:
     try:
         return f"{float(x):,.2f}"
@@ -53,7 +86,8 @@ def fmt_pct_direct(x) -> str:
     except Exception:
         return "N/A"
 
-def compute_multiples_fair_price(info: dict, peer_medians: dict, multiples: dict) -> Optional[float]:
+def compute_multiples_fair_price(current_price, trailing_eps, market_cap, shares_out,
+                                 peer_medians: dict, multiples: dict) -> Optional[float]:
     """
     Heuristic to derive a multiples-based 'fair price' using peer medians.
     Priority:
@@ -62,11 +96,8 @@ def compute_multiples_fair_price(info: dict, peer_medians: dict, multiples: dict
     3) Else if EV/EBITDA peer median and company EV/EBITDA available -> scale market cap
     Otherwise None.
     """
-    current_price = info.get("currentPrice")
-    trailing_eps = info.get("trailingEps")
     company_pe = multiples.get("PE")
     company_ev_ebitda = multiples.get("EV/EBITDA")
-    market_cap = info.get("marketCap")
 
     peer_pe = peer_medians.get("PE")
     peer_ev_ebitda = peer_medians.get("EV/EBITDA")
@@ -89,7 +120,7 @@ def compute_multiples_fair_price(info: dict, peer_medians: dict, multiples: dict
     if company_ev_ebitda and peer_ev_ebitda and market_cap:
         try:
             scaling = float(peer_ev_ebitda) / float(company_ev_ebitda)
-            return float(market_cap) * scaling / float(info.get("sharesOutstanding", 1))
+            return float(market_cap) * scaling / float(shares_out)
         except Exception:
             pass
 
@@ -99,20 +130,23 @@ def compute_multiples_fair_price(info: dict, peer_medians: dict, multiples: dict
 # Main action
 # -------------------------
 if st.button('Run Analysis'):
-    resolver = TickerResolver()
     ticker_input = company.strip()
-    ticker = resolver.resolve(ticker_input)
+    ticker = cached_resolve(ticker_input)
     st.write("Resolved ticker:", ticker)
 
-    df = DataFetcher(ticker)
-    if not df.validate_ticker():
+    bundle = _load_bundle(ticker)
+    if not bundle["valid"]:
         st.error('Ticker not valid or no market data available.')
         st.stop()
 
-    info = df.get_info()
-    income = df.get_income()
-    balance = df.get_balance()
-    cash = df.get_cashflow()
+    info = bundle["info"]
+    income = bundle["income"]
+    balance = bundle["balance"]
+    cash = bundle["cash"]
+    # info fields used below, read once
+    current_price = info.get('currentPrice')
+    market_cap = info.get('marketCap')
+    shares_out = info.get('sharesOutstanding', 1)
 
     # Fundamentals
     rev_g = compute_revenue_growth(income)
@@ -123,36 +157,43 @@ if st.button('Run Analysis'):
 
     # Compute FCF (best-effort)
     fcf = None
+    cols = cash.columns
+    col_set = set(cols)
     if not cash.empty:
-        for col in ["Free Cash Flow", "freeCashflow", "Free Cash Flow (TTM)"]:
-            if col in cash.columns and not cash[col].dropna().empty:
+        for col in FCF_COLUMNS:
+            s = cash[col].dropna() if col in col_set else None
+            if s is not None and len(s):
                 try:
-                    fcf = float(cash[col].dropna().iloc[-1])
+                    fcf = float(s.iat[-1])
                 except Exception:
                     fcf = None
                 break
 
     if fcf is None:
         try:
-            cfo_candidates = [c for c in cash.columns if 'Operating' in c or 'operating' in c]
-            capex_candidates = [c for c in cash.columns if 'Capital' in c or 'Capex' in c]
-            if cfo_candidates and capex_candidates:
-                cfo = float(cash[cfo_candidates[0]].dropna().iloc[-1])
-                capex = float(cash[capex_candidates[0]].dropna().iloc[-1])
-                fcf = cfo - capex
+            # one pass for the first operating-cash-flow and capex-like columns
+            cfo_col = capex_col = None
+            for c in cols:
+                if cfo_col is None and ('Operating' in c or 'operating' in c):
+                    cfo_col = c
+                elif capex_col is None and ('Capital' in c or 'Capex' in c):
+                    capex_col = c
+                if cfo_col is not None and capex_col is not None:
+                    cfo = float(cash[cfo_col].dropna().iat[-1])
+                    capex = float(cash[capex_col].dropna().iat[-1])
+                    fcf = cfo - capex
+                    break
         except Exception:
             fcf = None
 
-    # Resolve peers safely
-    raw_peers = [p.strip() for p in peers_input.split(',')] if peers_input else []
+    # Resolve peers safely (all names concurrently)
+    raw_peers = [p.strip() for p in peers_input.split(',') if p.strip()] if peers_input else []
+    raw_peers = list(dict.fromkeys(raw_peers))
     resolved_peers = []
-    for p in raw_peers:
-        if not p:
-            continue
-        try:
-            r = resolver.resolve(p)
+    for p, r in zip(raw_peers, asyncio.run(resolve_tickers_async(raw_peers))):
+        if r:
             resolved_peers.append(r)
-        except Exception:
+        else:
             st.warning(f"Could not resolve peer '{p}'. Skipping.")
 
     # Valuation (DCF + multiples)
@@ -163,31 +204,27 @@ if st.button('Run Analysis'):
     )
 
     # Peer medians (only resolved tickers)
-    peer_medians = peers_median(resolved_peers, ['PE', 'PB', 'EV/EBITDA']) if resolved_peers else {}
+    peer_medians = _cached_peers_median(tuple(sorted(resolved_peers)), ('PE', 'PB', 'EV/EBITDA')) if resolved_peers else {}
 
     # Compute a multiples-derived fair price (best-effort)
     multiples = val.get("multiples", {}) if val else {}
-    multiples_fair = compute_multiples_fair_price(info, peer_medians, multiples)
+    multiples_fair = compute_multiples_fair_price(current_price, info.get('trailingEps'), market_cap,
+                                                  shares_out, peer_medians, multiples)
 
     # Compute safe blended fair value using safe_intrinsic_price if available
     if safe_intrinsic_price:
         fair_value, entry_price = safe_intrinsic_price(info, val.get('intrinsic_price'), multiples_fair)
     else:
         # Fallback: simple weighted blend and sanity checks (duplicate of safe_intrinsic_price logic)
-        current = info.get("currentPrice")
+        current = current_price
         dcf_price = val.get('intrinsic_price') if val else None
-        values = []
-        if multiples_fair:
-            values.append(multiples_fair * 0.6)
-        if dcf_price:
-            values.append(dcf_price * 0.4)
-        if values:
-            fair_value = sum(values)
+        if multiples_fair or dcf_price:
+            fair_value = (multiples_fair or 0.0) * 0.6 + (dcf_price or 0.0) * 0.4
             if current:
+                # halve the excess above 2x price, floor at 0.3x price
                 if fair_value > current * 2:
                     fair_value = (fair_value + current * 2) / 2
-                if fair_value < current * 0.3:
-                    fair_value = max(fair_value, current * 0.3)
+                fair_value = max(fair_value, current * 0.3)
             entry_price = round(fair_value * 0.8, 2)
             fair_value = round(fair_value, 2)
         else:
@@ -195,10 +232,10 @@ if st.button('Run Analysis'):
 
     # Ratings and scoring
     ratings = {
-        'Revenue Growth': RatingEngine.rate_value(rev_g, (0, 5)) if rev_g else 'Data Unavailable',
-        'Net Income Growth': RatingEngine.rate_value(ni_g, (0, 5)) if ni_g else 'Data Unavailable',
-        'Operating Margin': RatingEngine.rate_value(opm*100 if opm else None, (5, 15)),
-        'ROIC': RatingEngine.rate_value(roic*100 if roic else None, (8, 12))
+        'Revenue Growth': RATE_GROWTH(rev_g) if rev_g else 'Data Unavailable',
+        'Net Income Growth': RATE_GROWTH(ni_g) if ni_g else 'Data Unavailable',
+        'Operating Margin': RATE_MARGIN(opm*100 if opm else None),
+        'ROIC': RATE_ROIC(roic*100 if roic else None)
     }
     score = RatingEngine.compute_global_score(ratings)
 
@@ -206,8 +243,8 @@ if st.button('Run Analysis'):
     # Display
     # -------------------------
     st.subheader('Key Figures')
-    st.write('Current price:', fmt(info.get('currentPrice')))
-    st.write('Market cap:', fmt(info.get('marketCap')))
+    st.write('Current price:', fmt(current_price))
+    st.write('Market cap:', fmt(market_cap))
     st.write('Revenue growth (5y avg):', fmt_pct_from_decimal(rev_g))
     st.write('ROIC (est):', fmt_pct_from_decimal(roic) if roic else 'N/A')
     st.write('Operating margin:', fmt_pct_from_decimal(opm) if opm else 'N/A')
@@ -218,11 +255,11 @@ if st.button('Run Analysis'):
 
     st.write('Fair value (blended):', fmt(fair_value) if fair_value else 'N/A')
     st.write('Entry price (20% safety margin):', fmt(entry_price) if entry_price else 'N/A')
-    st.write('Current market price:', fmt(info.get('currentPrice')))
+    st.write('Current market price:', fmt(current_price))
 
     # Valuation verdict
-    if fair_value and info.get('currentPrice') is not None:
-        cur = float(info.get('currentPrice'))
+    if fair_value and current_price is not None:
+        cur = float(current_price)
         if cur < entry_price:
             st.success("📉 Undervalued — price is below the suggested entry price")
         elif cur <= fair_value:
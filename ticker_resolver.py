@@ -7,8 +7,33 @@ Uses:
 3) Normalized fallback
 """
 
-import requests
+import asyncio
+import functools
+import re
+import threading
+import time
 import unicodedata
+from types import MappingProxyType
+from typing import List, Optional
+
+from http_session import SESSION
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # optional: stdlib json also accepts bytes
+    from json import loads as _loads
+
+
+# Input typed as a ticker: upper-case symbol with an optional exchange suffix
+# (AAPL, MC.PA, STLAM.MI, BRK-B). Matched on the raw input, so "apple" is not one.
+_TICKER_RE = re.compile(r"^[A-Z0-9]{1,6}([.-][A-Z0-9]{1,4})?$")
+
+
+# Autocomplete misses: query -> expiry (monotonic); insertion order gives FIFO eviction
+MISS_TTL = 300  # seconds
+MAX_MISSES = 512
+_misses: dict = {}
+_misses_lock = threading.Lock()
 
 
 class TickerResolver:
@@ -101,27 +126,55 @@ class TickerResolver:
     def _normalize(s: str) -> str:
         """Normalize text: lowercase, remove accents, trim."""
         s = s.strip().lower()
+        if s.isascii():
+            # nothing to decompose (plain tickers and English names)
+            return s
         s = unicodedata.normalize("NFD", s)
-        return "".join(c for c in s if unicodedata.category(c) != "Mn")
+        category = unicodedata.category
+        return "".join(c for c in s if category(c) != "Mn")
 
     @staticmethod
-    def _yahoo_autocomplete(query: str) -> str | None:
+    @functools.lru_cache(maxsize=1024)
+    def _yahoo_hit(query: str) -> str:
         """
-        Use Yahoo Finance unofficial autocomplete API to guess a ticker.
-        Returns ticker or None.
+        Ticker for `query` from Yahoo Finance's unofficial autocomplete API.
+        Raises LookupError on a miss, so the lru_cache only keeps hits.
         """
         try:
             url = f"https://query1.finance.yahoo.com/v1/finance/search?q={query}"
-            resp = requests.get(url, timeout=5)
+            resp = SESSION.get(url, timeout=5)
             resp.raise_for_status()
-            data = resp.json()
+            data = _loads(resp.content)
 
             quotes = data.get("quotes", [])
-            if quotes:
-                return quotes[0].get("symbol")
-        except Exception:
+            symbol = quotes[0].get("symbol") if quotes else None
+        except Exception as e:
+            raise LookupError(query) from e
+        if not symbol:
+            raise LookupError(query)
+        return symbol
+
+    @staticmethod
+    def _yahoo_autocomplete(query: str) -> str | None:
+        """
+        Use Yahoo Finance unofficial autocomplete API to guess a ticker.
+        Returns ticker or None. Misses are remembered for MISS_TTL seconds so a
+        repeated bad query (or one that timed out) costs nothing until then.
+        """
+        now = time.monotonic()
+        with _misses_lock:
+            expires = _misses.get(query)
+        if expires is not None and expires > now:
+            return None
+        try:
+            return TickerResolver._yahoo_hit(query)
+        except LookupError:
+            with _misses_lock:
+                _misses.pop(query, None)
+                _misses[query] = now + MISS_TTL
+                while len(_misses) > MAX_MISSES:
+                    _misses.pop(next(iter(_misses)))
             return None
-        return None
 
     # ---------------------------------------------------------------------
     # Public API
@@ -132,25 +185,71 @@ class TickerResolver:
 
         Resolution order:
         1) Normalize
-        2) Try internal map
+        2) Try internal map, then return ticker-shaped input (e.g. "MC.PA") as-is
         3) Try Yahoo autocomplete API
         4) Fallback: return normalized uppercase input
+
+        Autocomplete hits are memoized process-wide and misses for MISS_TTL seconds;
+        the other steps are dict/regex lookups.
         """
-        clean = self._normalize(user_input)
+        return self._resolve(user_input)
+
+    @staticmethod
+    def _resolve(user_input: str) -> str:
+        clean = TickerResolver._normalize(user_input)
 
         # Step 1: internal map
-        if clean in self.STOCK_MAP:
-            return self.STOCK_MAP[clean]
+        if clean in TickerResolver.STOCK_MAP_NORM:
+            return TickerResolver.STOCK_MAP_NORM[clean]
+
+        # Already ticker-shaped: no need to ask Yahoo
+        raw = user_input.strip()
+        if _TICKER_RE.match(raw):
+            return raw
 
         # Step 2: Yahoo autocomplete
-        ticker = self._yahoo_autocomplete(clean)
+        ticker = TickerResolver._yahoo_autocomplete(clean)
         if ticker:
             return ticker.upper()
 
         # Step 3: fallback — assume input is already a ticker
         return user_input.strip().upper()
 
+
+# STOCK_MAP keyed by normalized name, built once at import so lookups match
+# what resolve() produces (e.g. "crédit agricole" -> "credit agricole")
+TickerResolver.STOCK_MAP_NORM = MappingProxyType({
+    TickerResolver._normalize(k): v for k, v in TickerResolver.STOCK_MAP.items()
+})
+
+# shared instance behind resolve_ticker (resolution keeps no per-instance state)
+_DEFAULT_RESOLVER = TickerResolver()
+
+
 def resolve_ticker(user_input: str) -> str:
     """Convenience function to resolve ticker using TickerResolver class."""
-    resolver = TickerResolver()
-    return resolver.resolve(user_input)
\ No newline at end of file
+    return _DEFAULT_RESOLVER.resolve(user_input)
+
+
+async def resolve_tickers_async(names: List[str]) -> List[Optional[str]]:
+    """
+    Resolve many names concurrently, in input order (None where resolution failed).
+    STOCK_MAP hits are answered inline; the remaining names run resolve_ticker in
+    worker threads so their Yahoo autocomplete round-trips overlap.
+    """
+    results: List[Optional[str]] = [None] * len(names)
+    pending = []
+    for i, name in enumerate(names):
+        clean = TickerResolver._normalize(name)
+        if clean in TickerResolver.STOCK_MAP_NORM:
+            results[i] = TickerResolver.STOCK_MAP_NORM[clean]
+        else:
+            pending.append(i)
+
+    resolved = await asyncio.gather(
+        *(asyncio.to_thread(resolve_ticker, names[i]) for i in pending),
+        return_exceptions=True,
+    )
+    for i, r in zip(pending, resolved):
+        results[i] = r if isinstance(r, str) else None
+    return results
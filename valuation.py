@@ -0,0 +1,227 @@
+# valuation.py
+"""
+Valuation helpers: multiples, EV calculation, relative comparison, and a high-level
+function that runs both multiples and DCF and returns a consolidated valuation.
+"""
+
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping
+import math
+
+import numpy as np
+
+from jit_utils import njit
+
+# Labels for classify(): index = number of thresholds the value reaches
+_LABELS = np.array(["Undervalued", "Fair", "Overvalued"])
+
+
+def _readonly(values) -> np.ndarray:
+    arr = np.array(values, dtype=np.float64)
+    arr.setflags(write=False)
+    return arr
+
+
+# (undervalued below, overvalued from) per multiple, rule-of-thumb levels.
+# Shared by every call, so both the mapping and the arrays are read-only.
+VALUATION_THRESHOLDS: Mapping[str, np.ndarray] = MappingProxyType({
+    "PE": _readonly([15.0, 25.0]),
+    "PB": _readonly([1.5, 3.0]),
+    "EV/EBITDA": _readonly([8.0, 12.0]),
+    "P/FCF": _readonly([15.0, 25.0]),
+})
+
+
+# -------------------------
+# Numeric kernels (numba-compiled when available)
+# -------------------------
+@njit
+def _ev_kernel(market_cap: float, total_debt: float, cash: float) -> float:
+    return market_cap + total_debt - cash
+
+
+@njit
+def _ev_ebitda_kernel(ev: float, ebitda: float) -> float:
+    return ev / ebitda
+
+
+@njit
+def _safe_intrinsic_price_kernel(current: float, dcf_price: float, multiples_price: float):
+    """Blend DCF and multiples prices with sanity bounds. NaN marks a missing input/result."""
+    fair_value = 0.0
+    has_price = False
+
+    # 1. Multiples are usually the most stable → high weight
+    if multiples_price == multiples_price and multiples_price != 0.0:
+        fair_value += multiples_price * 0.6
+        has_price = True
+
+    # 2. DCF can be unstable → low weight
+    if dcf_price == dcf_price and dcf_price != 0.0:
+        fair_value += dcf_price * 0.4
+        has_price = True
+
+    if not has_price:
+        return math.nan, math.nan
+
+    # === SANITY CHECKS ===
+
+    # Prevent insane valuations (>200% of current price)
+    if fair_value > current * 2:
+        fair_value = (fair_value + current * 2) / 2
+
+    # Prevent downward anomalies (<30% of current price)
+    if fair_value < current * 0.3:
+        fair_value = current * 0.3
+
+    # Entry price = 20% safety margin
+    return fair_value, fair_value * 0.8
+
+
+def _as_float(x) -> float:
+    return math.nan if x is None else float(x)
+
+
+def base_multiples(info: dict) -> Dict[str, Optional[float]]:
+    """
+    Return a dictionary of common multiples (PE, PB, PS, EV/EBITDA, P/FCF).
+    Values are numeric (not 'Undervalued' strings) so the rating engine can compare vs peers.
+    Single pass: every `info` key is read once and EV, EV/EBITDA and P/FCF are computed inline.
+    """
+    get = info.get
+    market_cap = get("marketCap")
+    total_debt = get("totalDebt") or get("totalDebtLongTerm") or 0
+    cash = get("totalCash") or get("cash") or 0
+    ebitda = get("ebitda") or get("EBITDA")
+    fcf = get("freeCashflow")
+    shares = get("sharesOutstanding")
+    price = get("currentPrice")
+
+    ev_ebitda = None
+    if market_cap and ebitda:
+        try:
+            ev = _ev_kernel(float(market_cap), float(total_debt), float(cash))
+            ev_ebitda = float(_ev_ebitda_kernel(ev, float(ebitda)))
+        except (TypeError, ValueError):
+            ev_ebitda = None
+
+    # P/FCF if freeCashflow and shares/outstanding present
+    p_fcf = None
+    if fcf and shares and price:
+        try:
+            p_fcf = price / (fcf / shares)
+        except (TypeError, ZeroDivisionError):
+            p_fcf = None
+
+    return {
+        "PE": get("trailingPE") or get("forwardPE"),
+        "PB": get("priceToBook"),
+        "PS": get("priceToSalesTrailing12Months") or get("priceToSales"),
+        "EV/EBITDA": ev_ebitda,
+        "P/FCF": p_fcf,
+    }
+
+
+# kept for existing callers; same result as base_multiples
+simple_multiples_valuation = base_multiples
+
+
+def compute_ev(info: dict) -> Optional[float]:
+    """Enterprise value = market cap + totalDebt - cash"""
+    market_cap = info.get("marketCap")
+    if not market_cap:
+        return None
+    total_debt = info.get("totalDebt") or info.get("totalDebtLongTerm") or 0
+    cash = info.get("totalCash") or info.get("cash") or 0
+    return float(_ev_kernel(float(market_cap), float(total_debt), float(cash)))
+
+
+def compute_ev_ebitda(info: dict) -> Optional[float]:
+    return base_multiples(info)["EV/EBITDA"]
+
+
+def classify(values, thresholds: np.ndarray) -> np.ndarray:
+    """
+    Label many multiples at once: below thresholds[0] -> Undervalued,
+    below thresholds[1] -> Fair, otherwise Overvalued.
+    Missing (None/NaN) or non-positive multiples are labelled "Data Unavailable".
+    """
+    v = np.asarray(values, dtype=np.float64)
+    labels = _LABELS[np.searchsorted(thresholds, np.nan_to_num(v, nan=0.0), side="right")]
+    return np.where(np.isnan(v) | (v <= 0), "Data Unavailable", labels)
+
+
+def simple_valuation_batch(infos: List[dict]) -> List[Dict[str, str]]:
+    """
+    Label the multiples of many tickers in one pass per multiple.
+    Returns one dict multiple -> label per info dict, in input order.
+    """
+    multiples = [simple_multiples_valuation(info) for info in infos]
+    columns = {
+        key: classify([m.get(key) for m in multiples], thresholds)
+        for key, thresholds in VALUATION_THRESHOLDS.items()
+    }
+    return [{key: str(col[i]) for key, col in columns.items()} for i in range(len(infos))]
+
+
+def simple_valuation(info: dict) -> Dict[str, str]:
+    """Undervalued/Fair/Overvalued label per multiple for a single ticker."""
+    return simple_valuation_batch([info])[0]
+
+
+def consolidate_valuation(info: dict, fcf_now: float, forecast_growths: list = None, terminal_growth: float = 0.02, wacc: float = None):
+    """
+    High-level function:
+    - computes simple multiples
+    - runs a 2-stage DCF if possible, or 1-stage if only basics available
+    - returns numeric intrinsic price, suggested buy price and multiples
+    """
+    from dcf import estimate_wacc, dcf_two_stage, dcf_one_stage, intrinsic_value_per_share_from_ev, margin_of_safety_price
+
+    multiples = simple_multiples_valuation(info)
+    # estimate wacc if not provided
+    if wacc is None:
+        wacc = estimate_wacc(info) or 0.08
+
+    intrinsic_price = None
+    ev_value = None
+    # try two-stage if forecast growths supplied and fcf available
+    try:
+        if fcf_now and forecast_growths:
+            ev_value = dcf_two_stage(fcf_now, forecast_growths, terminal_growth, wacc)
+        elif fcf_now:
+            ev_value = dcf_one_stage(fcf_now, terminal_growth, wacc)
+    except Exception:
+        ev_value = None
+
+    if ev_value:
+        intrinsic_price = intrinsic_value_per_share_from_ev(ev_value, info)
+
+    suggested_buy = margin_of_safety_price(intrinsic_price, margin=0.20) if intrinsic_price else None
+
+    return {
+        "multiples": multiples,
+        "wacc": wacc,
+        "intrinsic_price": intrinsic_price,
+        "suggested_buy_price": suggested_buy,
+        "ev_value": ev_value
+    }
+
+def safe_intrinsic_price(info, dcf_price, multiples_price):
+    """
+    Produces a realistic entry price by combining DCF, multiples, and 
+    sanity filters to avoid unrealistic valuations.
+    """
+
+    current = info.get("currentPrice")
+    if current is None:
+        return None
+
+    fair_value, entry_price = _safe_intrinsic_price_kernel(
+        float(current), _as_float(dcf_price), _as_float(multiples_price)
+    )
+    if math.isnan(fair_value):
+        return None
+
+    return round(fair_value, 2), round(entry_price, 2)
+